@@ -185,6 +185,13 @@ CREATE TABLE IF NOT EXISTS runs (
   FOREIGN KEY (cut_id)
     REFERENCES cuts (id)
 );
+
+CREATE INDEX IF NOT EXISTS idx_runs_hg ON runs(hypergraph_id);
+CREATE INDEX IF NOT EXISTS idx_cuts2_hg_val ON cuts2(hypergraph_id, val);
+CREATE INDEX IF NOT EXISTS idx_cuts3_hg_val ON cuts3(hypergraph_id, val);
+CREATE INDEX IF NOT EXISTS idx_cuts4_hg_val ON cuts4(hypergraph_id, val);
+CREATE INDEX IF NOT EXISTS idx_cuts5_hg_val ON cuts5(hypergraph_id, val);
+CREATE INDEX IF NOT EXISTS idx_cuts6_hg_val ON cuts6(hypergraph_id, val);
 )";
 
   std::string sql_command = std::string(kInitialize) + PlantedHypergraph::make_table_sql_command();
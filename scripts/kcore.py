@@ -2,11 +2,22 @@
 
 import argparse
 import os
+import shutil
 import subprocess
 import tarfile
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
-from typing import List
+from typing import Dict, Iterator, List, Tuple
+
+
+def positive_int(value: str) -> int:
+    n = int(value)
+    if n <= 0:
+        raise argparse.ArgumentTypeError(f'{value} is not a positive integer')
+    return n
+
 
 parser = argparse.ArgumentParser(
     description='Run k-core decomposition on hypergraphs in a TAR file and report decompositions with interesting cuts.')
@@ -16,6 +27,8 @@ parser.add_argument('--bin', dest='bin', type=str,
                     help='Path to the `hkcore` binary. Otherwise this script will build it automatically.')
 parser.add_argument('-o', dest='outdir', type=str,
                     help='Path for output files', required=True)
+parser.add_argument('-j', dest='jobs', type=positive_int, default=os.cpu_count(),
+                    help='Number of `hkcore` processes to run at once. Defaults to the number of CPUs.')
 args = parser.parse_args()
 
 TARFILE = os.path.join(os.getcwd(), args.tarfile)
@@ -28,21 +41,57 @@ if not OUTPUT_PATH.exists():
     exit(1)
 
 
-class TarFileInfoIterator:
-    def __init__(self, tfile: tarfile.TarFile):
-        self._tfile = tfile
+@contextmanager
+def open_tarfile(path: str) -> Iterator[tarfile.TarFile]:
+    """Opens the tar for reading front to back. Gzipped tars are decompressed by `pigz` in a separate process if it is
+    installed, since Python's gzip module is much slower."""
+    pigz = shutil.which('pigz')
+    if pigz is None or not path.endswith(('.gz', '.tgz')):
+        with tarfile.open(path) as tfile:
+            yield tfile
+        return
+    with subprocess.Popen([pigz, '-dc', path], stdout=subprocess.PIPE) as p:
+        with tarfile.open(fileobj=p.stdout, mode='r|') as tfile:
+            yield tfile
+        # Drain anything after the end of the archive so pigz can exit
+        while p.stdout.read(1 << 20):
+            pass
+    # tarfile sees a pigz failure at a member boundary as the end of the archive, so check that it actually succeeded
+    if p.returncode != 0:
+        print(f'Error: pigz exited with code {p.returncode} while decompressing {path}')
+        exit(1)
+
+
+def extract_members(path: str) -> List[Tuple[int, str]]:
+    """Extracts every file in the tar to the current directory and returns the (size, name) of each. The TarFile (which
+    keeps every TarInfo it has read) is closed before returning."""
+    members = []
+    with open_tarfile(path) as tfile:
+        # Extract in archive order so the tar (possibly compressed) is only read front to back
+        for info in tfile:
+            if info.isfile():
+                print(f'Extracting {info.name} for analysis...')
+                tfile.extract(info)
+                members.append((info.size, info.name))
+    return members
 
-    def __iter__(self) -> 'TarFileInfoIterator':
-        return self
 
-    def __next__(self) -> tarfile.TarInfo:
-        info = self._tfile.next()
-        if info is None:
-            raise StopIteration()
-        return info
+def run_hkcore(name: str) -> None:
+    p = subprocess.Popen([BINARY_PATH, name, os.path.join(olddir, OUTPUT_PATH)])
+    if p.wait() != 0:
+        print(f'Process exited with non-zero exit code on {name}')
+    print(f'Done with {name}')
+    # The extracted copy is no longer needed, don't hold on to it until every hypergraph is done
+    os.remove(name)
+    print(f'Writing files to {OUTPUT_PATH}')
 
 
-with tarfile.open(TARFILE) as tf, tempfile.TemporaryDirectory() as tempdir:
+def run_hkcore_in_order(names: List[str]) -> None:
+    for name in names:
+        run_hkcore(name)
+
+
+with tempfile.TemporaryDirectory() as tempdir:
     olddir = os.getcwd()
     os.chdir(tempdir)
 
@@ -53,19 +102,23 @@ with tarfile.open(TARFILE) as tf, tempfile.TemporaryDirectory() as tempdir:
         subprocess.Popen(['make', 'hkcore']).wait()
         BINARY_PATH = './hkcore'
 
-    # Sort TarInfos so we can process them smallest to largest
-    tinfos: List[tarfile.TarInfo] = [
-        info for info in TarFileInfoIterator(tf) if info.isfile()]
-    tinfos.sort(key=lambda info: info.get_info()['size'])
-
-    for info in tinfos:
-        print(f'Extracting {info.name} for analysis...')
-        tf.extract(info)
-        p = subprocess.Popen([BINARY_PATH, info.name, os.path.join(olddir, OUTPUT_PATH)])
-        if p.wait() != 0:
-            print('Process exited with non-zero exit code')
-        print(f'Done with {info.name}')
-        subprocess.Popen(['ls']).wait()
-        print(f'Writing files to {OUTPUT_PATH}')
+    members = extract_members(TARFILE)
+
+    # Sort members so we can process them smallest to largest
+    members.sort()
+
+    # `hkcore` names its output files after the stem of the hypergraph file, so hypergraphs sharing a stem (e.g. a/x.hgr
+    # and b/x.hgr) are run one after another instead of writing to the same files at once
+    names_by_stem: Dict[str, List[str]] = {}
+    for _, name in members:
+        names_by_stem.setdefault(Path(name).stem, []).append(name)
+    for stem, names in names_by_stem.items():
+        if len(names) > 1:
+            print(f'Warning: {", ".join(names)} share the output files {stem}.*, '
+                  'they will run one at a time and later ones will overwrite earlier ones')
+
+    # Otherwise each hypergraph is independent, so run several `hkcore` processes at once (still smallest first)
+    with ThreadPoolExecutor(max_workers=args.jobs) as executor:
+        list(executor.map(run_hkcore_in_order, names_by_stem.values()))
 
 print('Done')
@@ -18,13 +18,14 @@ Outputs a graph in a file named 'output.pdf'
 """
 
 import matplotlib.pyplot as plt
+import numpy as np
 import os
 import sqlite3
 import sys
 
 
 def get_series_from_folder2(path):
-    """Get list of (size, cxy_time) from a sqlite3 file"""
+    """Get arrays (sizes, cxy_times) from a sqlite3 file"""
     conn = sqlite3.connect(os.path.join(path, 'data.db'))
 
     c = conn.cursor()
@@ -37,42 +38,24 @@ def get_series_from_folder2(path):
             ORDER BY hypergraphs.size
             ''')
 
-    return c.fetchall()
+    series = np.array(c.fetchall(), dtype=np.float64).reshape(-1, 2)
+    return series[:, 0], series[:, 1]
 
 
 # exit()
 
 
 def get_series_from_folder(path):
-    """Get list of (size, cxy_time) from a folder 'say k=2'"""
+    """Get arrays (sizes, cxy_times) from a folder 'say k=2'"""
     return get_series_from_file(os.path.join(path, 'data.csv'))
 
 
 def get_series_from_file(path):
-    """Get list of (size, cxy_time) from a CSV file"""
-    with open(path) as f:
-        f.readline()  # Discard header line
-
-        series = []
-
-        for line in f:
-            line = line.strip()
-            size = float(line.split(',')[1])
-            time = float(line.split(',')[3])
-            series.append((size, time))
-
-    return series
-
-
-def unzip(l):
-    """Unzips a list of tuples into a tuple of two lists
-
-    e.g. [(1,2), (3, 4)] -> ([1, 3], [2, 4])
-    """
-    xs = [t[0] for t in l]
-    ys = [t[1] for t in l]
-
-    return xs, ys
+    """Get arrays (sizes, cxy_times) from a CSV file"""
+    series = np.loadtxt(path, delimiter=',', skiprows=1, usecols=(1, 3), ndmin=2)
+    if series.size == 0:
+        return np.empty(0), np.empty(0)
+    return series[:, 0], series[:, 1]
 
 
 # plt.title(f'Discovery time of CXY on planted instances with different ranks, {os.path.basename(sys.argv[1])}')
@@ -89,7 +72,7 @@ folders.sort(key=lambda name: int(name[-2:]))
 
 print(folders)
 for folder in folders:
-    xs, ys = unzip(get_series_from_folder2(folder))
+    xs, ys = get_series_from_folder2(folder)
     print(xs, ys)
     plt.plot(xs, ys, label=f'rank={int(folder[-2:])}', marker='.')
     min_x = xs[0] if min_x is None else max(min_x, xs[0])
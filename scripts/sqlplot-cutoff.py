@@ -18,10 +18,12 @@ def extract_vertices_from_name(name: str) -> str:
     return suffix[:suffix.find('_')]
 
 
+import matplotlib
+matplotlib.use('Agg')
 import matplotlib.pyplot as plt
+import numpy as np
 import os
 import sys
-from itertools import takewhile
 
 src = sys.argv[1]
 dest = sys.argv[2]
@@ -31,58 +33,53 @@ if not os.path.exists(dest):
 elif not os.path.isdir(dest):
     print(f'Error: {dest} already exists but is not a directory')
 
+# Only plot these algorithms if given, otherwise plot all of them
+algos_to_plot = set(sys.argv[3].split(',')) if len(sys.argv) > 3 else None
+
 hypergraph_files = (file for file in os.listdir(src) if file.endswith('data.txt'))
 
+# Reuse one figure for every plot instead of building a new one per file
+plt.rcParams['path.simplify_threshold'] = 1.0
+fig, ax = plt.subplots()
+
 for filename in hypergraph_files:
-  name = filename[:-len('.data.txt')]
-
-  plt.xlabel('Fraction of MW time')
-  plt.ylabel('Suboptimality factor')
-
-  file = open(os.path.join(src, filename))
-  cutoffs = [float(cutoff) for cutoff in file.readline().strip().split(',')[1:]]
-
-  plt.axhline(y=1, color='gray', linestyle=':')
-
-  for line in file:
-      line = line.strip()
-      algo = line.split(',')[0]
-      if len(sys.argv) > 3:
-          if algo not in sys.argv[3].split(','):
-              continue
-
-      factors = [float(factor) for factor in line.split(',')[1:]]
-
-      # Cutoff the instances that could not finish in time
-      # Technically this could have actually finished in time but just been a very large cut, but unlikely
-      cutoff_factor = [(cutoff, factor) for cutoff, factor in zip(cutoffs, factors) if factor < 1e10]
-
-
-      # Only plot the first cutoff that is 1
-      class Predicate:
-          def __init__(self):
-            self.seen_cut_factor_one = False
-
-        def __call__(self, tup):
-            cutoff, factor = tup
-            if self.seen_cut_factor_one:
-                return False
-            if factor <= 1.0:
-                self.seen_cut_factor_one = True
-            return True
-    cutoff_factor = list(takewhile(Predicate(), cutoff_factor))
-
-    cutoffs_filtered = [cutoff for cutoff, factor in cutoff_factor]
-    factors_filtered = [factor for cutoff, factor in cutoff_factor]
-
-      if len(cutoff_factor) > 1:
-          if algo == 'KK':
-              plt.plot(cutoffs_filtered, factors_filtered, label=algo, color='green')
-              continue
-          plt.plot(cutoffs_filtered, factors_filtered, label=algo)
-    else:
-        plt.plot(cutoffs_filtered, factors_filtered, marker='.', label=algo)
-
-  plt.legend()
-  plt.savefig(os.path.join(dest, f'{extract_vertices_from_name(name)}'))
-  plt.close()
+    name = filename[:-len('.data.txt')]
+
+    ax.clear()
+    ax.set_xlabel('Fraction of MW time')
+    ax.set_ylabel('Suboptimality factor')
+
+    with open(os.path.join(src, filename)) as file:
+        cutoffs = np.fromstring(file.readline().split(',', 1)[1], sep=',')
+        rows = [line.split(',', 1) for line in file]
+
+    ax.axhline(y=1, color='gray', linestyle=':')
+
+    for algo, line in rows:
+        if algos_to_plot is not None and algo not in algos_to_plot:
+            continue
+
+        factors = np.fromstring(line, sep=',')
+
+        # Cutoff the instances that could not finish in time
+        # Technically this could have actually finished in time but just been a very large cut, but unlikely
+        finished = factors < 1e10
+        cutoffs_filtered, factors_filtered = cutoffs[finished], factors[finished]
+
+        # Only plot the first cutoff that is 1
+        ones = np.flatnonzero(factors_filtered <= 1.0)
+        if ones.size > 0:
+            cutoffs_filtered, factors_filtered = cutoffs_filtered[:ones[0] + 1], factors_filtered[:ones[0] + 1]
+
+        if len(factors_filtered) > 1:
+            if algo == 'KK':
+                ax.plot(cutoffs_filtered, factors_filtered, label=algo, color='green')
+                continue
+            ax.plot(cutoffs_filtered, factors_filtered, label=algo)
+        else:
+            ax.plot(cutoffs_filtered, factors_filtered, marker='.', label=algo)
+
+    ax.legend()
+    fig.savefig(os.path.join(dest, f'{extract_vertices_from_name(name)}'))
+
+plt.close(fig)
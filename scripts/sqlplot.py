@@ -9,11 +9,12 @@ More specifically, will plot the discovery times of the algorithms in the sqlite
 '<source>/data.db'.
 """
 
+import csv
 import matplotlib.pyplot as plt
 import os
 import sqlite3
 import sys
-from typing import Tuple, List
+from typing import Dict, Tuple, List
 
 src_dir = sys.argv[1]
 dest = sys.argv[2]
@@ -21,6 +22,8 @@ dest = sys.argv[2]
 db_path = os.path.join(src_dir, 'data.db')
 
 conn = sqlite3.connect(db_path)
+conn.execute('PRAGMA temp_store=MEMORY')
+conn.execute('PRAGMA cache_size=-200000')
 
 # Get algos
 c = conn.cursor()
@@ -29,52 +32,48 @@ c.execute('SELECT DISTINCT algo FROM runs')
 algos = [row[0] for row in c.fetchall()]
 
 
-def make_select(algo_name: str) -> str:
-    return f"(SELECT hypergraph_id, AVG(time_elapsed_ms) as {algo_name}_time from runs WHERE algo='{algo_name}' GROUP BY hypergraph_id) AS {algo_name}"
+def make_column(algo_name: str) -> str:
+    return f'AVG(CASE WHEN algo=? THEN time_elapsed_ms END) AS "{algo_name}_time"'
 
 
-# Make CSV
+# Make CSV, pivoting the runs of every algo into columns in a single scan
 query = 'SELECT hypergraphs.id, hypergraphs.size, hypergraphs.num_vertices'
 for algo in algos:
-    query += f', {algo}_time'
-query += '\nFROM\n'
-query += make_select(algos[0]) + "\n"
-for i in range(1, len(algos)):
-    query += 'INNER JOIN\n'
-    query += make_select(algos[i]) + '\n'
-    query += f'ON {algos[i - 1]}.hypergraph_id = {algos[i]}.hypergraph_id\n'
-query += f'INNER JOIN hypergraphs ON {algos[-1]}.hypergraph_id = hypergraphs.id\n'
+    query += f',\n{make_column(algo)}'
+query += '\nFROM runs INNER JOIN hypergraphs ON runs.hypergraph_id = hypergraphs.id\n'
+query += 'GROUP BY hypergraphs.id\n'
 query += 'ORDER BY size'
 c = conn.cursor()
-c.execute(query)
+c.arraysize = 10000
+c.execute(query, algos)
 
-csv = open('data.csv', 'w+')
-col_names = [d[0] for d in c.description]
-print(','.join(col_names), file=csv)
-for row in c.fetchall():
-    row = [str(e) for e in row]
-    print(','.join(row), file=csv)
+# Series of (sizes, times) for each algo, shared by every plot. Hypergraphs an algo was not run on are skipped.
+series: Dict[str, Tuple[List[int], List[float]]] = {algo: ([], []) for algo in algos}
 
+# Stream the rows in batches, writing them to the CSV and collecting the series at the same time. Like the per-algo
+# joins this replaced, the CSV only has the hypergraphs that every algo was run on
+with open('data.csv', 'w+', newline='') as csv_file:
+    writer = csv.writer(csv_file, lineterminator='\n')
+    writer.writerow(d[0] for d in c.description)
+    for rows in iter(c.fetchmany, []):
+        writer.writerows(row for row in rows if None not in row[3:])
+        for row in rows:
+            for i, algo in enumerate(algos):
+                time = row[3 + i]
+                if time is not None:
+                    series[algo][0].append(row[1])
+                    series[algo][1].append(time)
 
-def make_query(algo: str) -> str:
-    return f'SELECT hypergraphs.id, hypergraphs.size, {algo}_time FROM {make_select(algo)} INNER JOIN hypergraphs ON {algo}.hypergraph_id = hypergraphs.id ORDER BY size'
 
-
-def get_series(algo: str) -> Tuple[List[int], List[int]]:
-    c = conn.cursor()
-    c.execute(make_query(algo))
-    rows = c.fetchall()
-    return (
-        [row[1] for row in rows],
-        [row[2] for row in rows]
-    )
+# Only plot these algorithms if given, otherwise plot all of them
+algos_to_plot = set(sys.argv[3].split(',')) if len(sys.argv) > 3 else None
 
 
 def make_plot(filename: str, title: str, filter=None):
     plt.xlabel('Hypergraph size')
     plt.ylabel('Discovery time (ms)')
     for algo in algos:
-        xs, ys = get_series(algo)
+        xs, ys = series[algo]
         if algo == 'mw':
             algo = 'MW'
         if algo == 'sparseMW':
@@ -87,9 +86,8 @@ def make_plot(filename: str, title: str, filter=None):
             algo = 'CXY'
         if algo == 'fpz':
             algo = 'FPZ'
-        if len(sys.argv) > 3:
-            if algo not in sys.argv[3].split(','):
-                continue
+        if algos_to_plot is not None and algo not in algos_to_plot:
+            continue
         plt.plot(xs, ys, label=algo, marker='.')
     plt.legend()
     plt.savefig(dest)